@@ -1,39 +1,76 @@
+import contextlib
 import os
-import re
+import time
+import zipfile
 import streamlit as st
 from multi_agents import *
-from langgraph.graph import StateGraph, END
 from PIL import Image
 from email_utils import send_interview_email
 import pandas as pd
+import sqlite3
+import result_store
+import skill_index
+import bulk_ingest
+
+
+# Agents whose output is streamed live into the page while a resume is processed
+STREAM_AGENT_LABELS = {
+    "Resume_agent": "📄 Resume Agent (Candidate Info)",
+    "JD_agent": "📋 JD Agent (Job Requirements)",
+    "Redflag_agent": "🚩 Red Flag Agent (Concerns)",
+    "Recruiter_agent": "🧑‍💼 Recruiter Agent (Evaluation)",
+}
+
+# Minimum interval between re-renders of a streaming placeholder
+STREAM_REFRESH_SECONDS = 0.1
+
+# Rows shown on screen for stored results (exports are never capped)
+STORE_DISPLAY_ROWS = 200
+
+# Resumes whose agent outputs are shown in the Per-Resume Details tab
+PER_RESUME_DETAIL_LIMIT = 20
+
+
+def open_store():
+    """
+    Open a result-store connection for the current script run.
+    Use it in a `with` block so it is closed when the block ends; each run has
+    its own connection, so concurrent sessions never share a transaction.
+    """
+    return contextlib.closing(result_store.get_connection())
+
+
+def load_screening_outputs(screening_id) -> dict:
+    """
+    Load one screening's agent outputs from the result store ({} if not stored).
+    """
+    if screening_id is None:
+        return {}
+    with open_store() as conn:
+        return result_store.get_screening_outputs(conn, screening_id) or {}
 
 
 def load_image(image_file):
     return Image.open(image_file)
 
 
-def extract_score_from_text(text: str) -> int:
+def iter_resumes(resume_files, resume_zip=None, server_path="", on_skip=None):
     """
-    Try to extract a score like '82/100' or 'Score: 82' from the recruiter agent output.
-    Returns 0 if not found.
+    Yield (file_name, pdf_bytes) one resume at a time from the individual PDF
+    uploads, an uploaded zip archive and a server-side zip / folder path.
     """
-    # Pattern 1: 82/100
-    match = re.search(r'(\d+)\s*/\s*100', text)
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            pass
+    for pdf in resume_files or []:
+        yield pdf.name, pdf.read()
 
-    # Pattern 2: Score: 82
-    match2 = re.search(r'[Ss]core[^0-9]*(\d+)', text)
-    if match2:
+    if resume_zip is not None:
         try:
-            return int(match2.group(1))
-        except ValueError:
-            pass
+            yield from bulk_ingest.iter_zip_resumes(resume_zip, on_skip=on_skip)
+        except zipfile.BadZipFile:
+            if on_skip is not None:
+                on_skip(resume_zip.name, "not a valid zip archive")
 
-    return 0
+    if server_path:
+        yield from bulk_ingest.iter_server_path(server_path, on_skip=on_skip)
 
 
 def main():
@@ -93,7 +130,8 @@ Upload one or many **resumes** and a **job description**, and let the agents:
         email_mapping_file = st.file_uploader(
             "Upload CSV mapping resumes to candidate emails",
             type=["csv"],
-            help="CSV must contain columns: 'resume' and 'email'. 'resume' should match the uploaded file name.",
+            help="CSV must contain columns: 'resume' and 'email'. 'resume' should match the uploaded file name "
+            "(for zip / folder drops: the path inside the archive or folder, e.g. 'batch1/cv.pdf').",
         )
 
         st.markdown(
@@ -129,6 +167,22 @@ Upload one or many **resumes** and a **job description**, and let the agents:
         if resume_files:
             st.success(f"{len(resume_files)} resume(s) uploaded successfully ✅")
 
+        # ---- BULK INGESTION (ZIP / SERVER-SIDE FOLDER) ----
+        with st.expander("📦 Bulk ingestion (zip archive or server folder)", expanded=False):
+            resume_zip = st.file_uploader(
+                "Upload a zip archive of resumes",
+                type=["zip"],
+                key="resume_zip_uploader",
+                help="PDFs inside are read one at a time; non-PDF and oversized entries are skipped.",
+            )
+            server_path = ""
+            if bulk_ingest.RESUME_DROP_ROOT:
+                server_path = st.text_input(
+                    f"Or a zip file / folder inside {bulk_ingest.RESUME_DROP_ROOT} on the server",
+                    placeholder="2024-06.zip",
+                    help="Best for very large drops: nothing is uploaded or held in memory up front.",
+                )
+
     # ---- JD UPLOAD / TEXT ----
     with col_right:
         st.markdown("### 📋 Job Description")
@@ -162,45 +216,67 @@ Upload one or many **resumes** and a **job description**, and let the agents:
     # ---------------- PIPELINE EXECUTION ----------------
     if run_clicked:
         # Basic validation
-        if not resume_files:
-            st.error("⚠️ Please upload at least one resume (PDF).")
+        if not resume_files and resume_zip is None and not server_path.strip():
+            st.error("⚠️ Please upload at least one resume (PDF), a zip archive or a server path.")
+            return
+
+        if resume_zip is not None and not zipfile.is_zipfile(resume_zip):
+            st.error(f"⚠️ {resume_zip.name} is not a valid zip archive.")
             return
 
+        if server_path.strip():
+            try:
+                bulk_ingest.resolve_drop_path(server_path.strip())
+            except ValueError as e:
+                st.error(f"⚠️ {e}")
+                return
+
         if job_description.strip() == "":
             st.error("⚠️ Please upload or paste a Job Description.")
             return
 
         # ----- Build the workflow once -----
-        workflow = StateGraph(AgentState)
-        workflow.add_node("Resume_agent", agent)
-        workflow.add_node("JD_agent", JD_agent)
-        workflow.add_node("Redflag_agent", redflag_agent)
-        workflow.add_node("Recruiter_agent", recruit_agent)
-
-        workflow.set_entry_point("Resume_agent")
-        workflow.add_edge("Resume_agent", "JD_agent")
-        workflow.add_edge("Resume_agent", "Redflag_agent")
-        workflow.add_edge("JD_agent", "Recruiter_agent")
-        workflow.add_edge("Redflag_agent", "Recruiter_agent")
-        workflow.add_edge("Recruiter_agent", END)
-
-        app_graph = workflow.compile()
-
-        with st.spinner("🤖 Running multi-agent evaluation for all resumes..."):
+        app_graph = build_workflow()
+
+        with open_store() as store_conn, st.spinner(
+            "🤖 Running multi-agent evaluation for all resumes..."
+        ):
             # Draw workflow graph once
             img_data = app_graph.get_graph().draw_mermaid_png()
             with open("workflow.png", "wb") as f:
                 f.write(img_data)
 
-            all_results = []  # store results for each resume
+            # Only name, score and store id per resume, so memory stays flat for
+            # large batches; agent outputs are loaded from the result store on demand
+            all_results = []
+            skipped_entries = []  # (name, reason) for non-PDF / oversized archive entries
+
+            # ----- Process each resume one-by-one (read lazily, one in memory at a time) -----
+            resumes = iter_resumes(
+                resume_files,
+                resume_zip,
+                server_path.strip(),
+                on_skip=lambda name, reason: skipped_entries.append((name, reason)),
+            )
 
-            # ----- Process each resume one-by-one -----
-            for idx, pdf in enumerate(resume_files, start=1):
-                st.markdown(f"### 📄 Processing Resume {idx}: **{pdf.name}**")
+            # One set of live placeholders, reused (and cleared) for every resume
+            progress = st.empty()
+            placeholders = {}
+            agent_columns = st.columns(2)
+            for col_idx, (key, label) in enumerate(STREAM_AGENT_LABELS.items()):
+                with agent_columns[col_idx % 2]:
+                    st.markdown(f"**{label}**")
+                    placeholders[key] = st.empty()
+            last_score = st.empty()
+
+            for idx, (resume_name, resume_bytes) in enumerate(resumes, start=1):
+                progress.markdown(f"### 📄 Processing Resume {idx}: **{resume_name}**")
+                for placeholder in placeholders.values():
+                    placeholder.caption("Waiting...")
 
                 # Save this resume as Resume.pdf (multi_agents.py expects this file)
                 with open("Resume.pdf", "wb") as f:
-                    f.write(pdf.read())
+                    f.write(resume_bytes)
 
                 # Initial messages into the graph
                 inputs = {
@@ -209,7 +285,9 @@ Upload one or many **resumes** and a **job description**, and let the agents:
                     ]
                 }
 
-                outputs = app_graph.stream(inputs)
+                # "messages" yields LLM tokens as they arrive,
+                # "updates" yields each node's final output when it finishes
+                outputs = app_graph.stream(inputs, stream_mode=["messages", "updates"])
 
                 # Collect results for this resume
                 results_by_agent = {
@@ -218,11 +296,29 @@ Upload one or many **resumes** and a **job description**, and let the agents:
                     "Redflag_agent": [],
                     "Recruiter_agent": [],
                 }
+                streamed_chunks = {key: [] for key in placeholders}
+                last_render = {key: 0.0 for key in placeholders}
                 recruiter_raw_text = ""
+                timings = {}  # node -> seconds from start until it finished
+                start_time = time.perf_counter()
+
+                for mode, output in outputs:
+                    if mode == "messages":
+                        chunk, metadata = output
+                        key = metadata.get("langgraph_node")
+                        if key in placeholders and chunk.content:
+                            streamed_chunks[key].append(chunk.content)
+                            # Re-render at most every STREAM_REFRESH_SECONDS; the final
+                            # text is always rendered from the "updates" event below
+                            now = time.perf_counter()
+                            if now - last_render[key] >= STREAM_REFRESH_SECONDS:
+                                placeholders[key].markdown("".join(streamed_chunks[key]) + "▌")
+                                last_render[key] = now
+                        continue
 
-                for output in outputs:
                     for key, value in output.items():
-                        messages = value.get("messages", [])
+                        timings[key] = round(time.perf_counter() - start_time, 2)
+                        messages = (value or {}).get("messages", [])
                         for msg in messages:
                             text = str(msg)
                             if key in results_by_agent:
@@ -231,21 +327,41 @@ Upload one or many **resumes** and a **job description**, and let the agents:
                                 results_by_agent[key] = [text]
                             if key == "Recruiter_agent":
                                 recruiter_raw_text = text
+                            if key in placeholders:
+                                placeholders[key].markdown(text)
 
                 score = extract_score_from_text(recruiter_raw_text)
 
+                # Persist so results can be re-ranked / exported later without the LLM
+                screening_id = None
+                try:
+                    screening_id = result_store.save_screening(
+                        store_conn,
+                        resume_name,
+                        resume_bytes,
+                        job_description,
+                        results_by_agent,
+                        score,
+                        dict(AGENT_MODELS),
+                        PROMPT_VERSION,
+                        timings,
+                    )
+                    skill_index.index_screening(store_conn, screening_id)
+                except Exception as e:
+                    st.warning(f"Could not save result for {resume_name}: {e}")
+
                 # Store for global summary
                 all_results.append(
-                    {
-                        "file": pdf.name,
-                        "score": score,
-                        "recruiter_text": recruiter_raw_text,
-                        "agents": results_by_agent,
-                    }
+                    {"file": resume_name, "score": score, "screening_id": screening_id}
                 )
 
-                st.info(f"Score for **{pdf.name}**: **{score} / 100**")
-                st.markdown("---")
+                last_score.info(f"Score for **{resume_name}**: **{score} / 100**")
+
+            if skipped_entries:
+                st.warning(
+                    f"Skipped {len(skipped_entries)} archive / folder entries:\n"
+                    + "\n".join(f"- {name}: {reason}" for name, reason in skipped_entries)
+                )
 
         st.success("✅ Multi-agent pipeline completed for all resumes.")
 
@@ -280,7 +396,8 @@ Upload one or many **resumes** and a **job description**, and let the agents:
                 if len(all_results) == 1:
                     single = all_results[0]
                     score = single["score"]
-                    recruiter_text = single["recruiter_text"]
+                    outputs = load_screening_outputs(single["screening_id"])
+                    recruiter_text = outputs.get("Recruiter_agent") or "Recruiter output not available."
 
                     st.markdown("### 🧾 Detailed Result (Single Resume Mode)")
                     st.metric("Match Score", f"{score} / 100")
@@ -412,43 +529,37 @@ Upload one or many **resumes** and a **job description**, and let the agents:
             if not all_results:
                 st.write("No resume results to display.")
             else:
-                for r in all_results:
-                    st.markdown(f"#### 📄 {r['file']} — Score: {r['score']} / 100")
-                    agents = r["agents"]
-
-                    # Resume Agent
-                    with st.expander("📄 Resume Agent Output (Candidate Info)", expanded=False):
-                        if agents.get("Resume_agent"):
-                            for out in agents["Resume_agent"]:
-                                st.write(out)
-                        else:
-                            st.write("No output captured from Resume_agent.")
+                # Details for the best-scoring resumes only; the rest are in the result store
+                detailed = sorted(all_results, key=lambda r: r["score"], reverse=True)
+                if len(detailed) > PER_RESUME_DETAIL_LIMIT:
+                    st.caption(
+                        f"Showing the top {PER_RESUME_DETAIL_LIMIT} of {len(detailed)} resumes. "
+                        "Use Stored Screening Results below for the rest."
+                    )
+                    detailed = detailed[:PER_RESUME_DETAIL_LIMIT]
 
-                    # JD Agent
-                    with st.expander("📋 JD Agent Output (Job Requirements)", expanded=False):
-                        if agents.get("JD_agent"):
-                            for out in agents["JD_agent"]:
-                                st.write(out)
-                        else:
-                            st.write("No output captured from JD_agent.")
+                with open_store() as detail_conn:
+                    outputs_by_id = {
+                        r["screening_id"]: result_store.get_screening_outputs(detail_conn, r["screening_id"])
+                        for r in detailed
+                        if r["screening_id"] is not None
+                    }
 
-                    # Redflag Agent
-                    with st.expander("🚩 Red Flag Agent Output (Concerns)", expanded=False):
-                        if agents.get("Redflag_agent"):
-                            for out in agents["Redflag_agent"]:
-                                st.write(out)
-                        else:
-                            st.write("No output captured from Redflag_agent.")
-
-                    # Recruiter Agent
-                    with st.expander(
-                        "🧑‍💼 Recruiter Agent Output (Detailed Evaluation)", expanded=False
-                    ):
-                        if agents.get("Recruiter_agent"):
-                            for out in agents["Recruiter_agent"]:
-                                st.write(out)
-                        else:
-                            st.write("No output captured from Recruiter_agent.")
+                for r in detailed:
+                    st.markdown(f"#### 📄 {r['file']} — Score: {r['score']} / 100")
+                    agents = outputs_by_id.get(r["screening_id"]) or {}
+
+                    for key, title in [
+                        ("Resume_agent", "📄 Resume Agent Output (Candidate Info)"),
+                        ("JD_agent", "📋 JD Agent Output (Job Requirements)"),
+                        ("Redflag_agent", "🚩 Red Flag Agent Output (Concerns)"),
+                        ("Recruiter_agent", "🧑‍💼 Recruiter Agent Output (Detailed Evaluation)"),
+                    ]:
+                        with st.expander(title, expanded=False):
+                            if agents.get(key):
+                                st.write(agents[key])
+                            else:
+                                st.write(f"No output captured from {key}.")
 
                     st.markdown("---")
 
@@ -465,6 +576,222 @@ Upload one or many **resumes** and a **job description**, and let the agents:
             except Exception:
                 st.warning("Workflow image not available.")
 
+    # ---------------- STORED RESULTS (HISTORY / RANKING / EXPORT) ----------------
+    st.markdown("---")
+    with st.expander("🗄️ Stored Screening Results (History, Ranking & Export)", expanded=False):
+        try:
+            with open_store() as conn:
+                show_stored_results(conn)
+        except sqlite3.Error as e:
+            st.error(f"Could not open result store: {e}")
+
+    with st.expander("🎯 Re-match Stored Candidates to this Job Description", expanded=False):
+        with open_store() as conn:
+            show_rematch(conn, job_description)
+
+
+def show_stored_results(conn):
+    """
+    Query the local result store: re-rank past candidates per JD, browse
+    history and export to CSV / Parquet. No LLM calls are made here.
+    """
+    jds = result_store.list_jds(conn)
+
+    if jds.empty:
+        st.info("No stored screenings yet. Run a screening to populate the store.")
+        return
+
+    # Options are JD ids (stable across runs); labels carry the live counts
+    jd_labels = {None: "All job descriptions"}
+    for _, row in jds.iterrows():
+        jd_labels[int(row["id"])] = f"#{row['id']} — {row['title']} ({row['screenings']} screened)"
+
+    col_jd, col_score = st.columns([2, 1])
+    with col_jd:
+        jd_id = st.selectbox(
+            "Job description",
+            list(jd_labels.keys()),
+            format_func=lambda option: jd_labels[option],
+            key="store_jd",
+        )
+    with col_score:
+        min_score = st.slider("Minimum score", 0, 100, 0, key="store_min_score")
+
+    st.markdown("#### 🏆 Ranking")
+    # Fetch one extra row only to know whether the table is truncated
+    ranking = result_store.get_ranking(
+        conn, jd_id=jd_id, min_score=min_score, limit=STORE_DISPLAY_ROWS + 1
+    )
+    st.dataframe(ranking.head(STORE_DISPLAY_ROWS), use_container_width=True)
+    if len(ranking) > STORE_DISPLAY_ROWS:
+        st.caption(f"Showing top {STORE_DISPLAY_ROWS} candidates. Exports contain all of them.")
+
+    st.markdown("#### 🕑 History")
+    history = result_store.get_history(
+        conn, jd_id=jd_id, min_score=min_score, limit=STORE_DISPLAY_ROWS + 1
+    )
+    st.dataframe(history.head(STORE_DISPLAY_ROWS), use_container_width=True)
+    if len(history) > STORE_DISPLAY_ROWS:
+        st.caption(f"Showing latest {STORE_DISPLAY_ROWS} screenings. Exports contain all of them.")
+
+    # Full exports are only built on request, and cached until new results arrive
+    export_key = (jd_id, min_score, result_store.get_latest_screening_id(conn))
+    if st.button("📦 Prepare export (CSV / Parquet)"):
+        st.session_state["store_export_key"] = export_key
+
+    if st.session_state.get("store_export_key") != export_key:
+        return
+
+    csv_data, parquet_data, parquet_error = build_store_exports(conn, *export_key)
+
+    col_csv, col_parquet = st.columns(2)
+    with col_csv:
+        st.download_button(
+            "⬇️ Export results (CSV)",
+            data=csv_data,
+            file_name="screening_results.csv",
+            mime="text/csv",
+        )
+    with col_parquet:
+        if parquet_data is not None:
+            st.download_button(
+                "⬇️ Export results (Parquet)",
+                data=parquet_data,
+                file_name="screening_results.parquet",
+                mime="application/octet-stream",
+            )
+        else:
+            st.warning(f"Parquet export unavailable: {parquet_error}")
+
+
+@st.cache_data(show_spinner="Preparing export...")
+def build_store_exports(_conn, jd_id, min_score, latest_screening_id):
+    """
+    Build CSV and Parquet exports of the full filtered history (no row limit).
+    latest_screening_id is only part of the cache key, so new results invalidate it.
+    Returns (csv_bytes, parquet_bytes or None, parquet error message or None).
+    """
+    history = result_store.get_history(_conn, jd_id=jd_id, min_score=min_score)
+    csv_data = result_store.to_csv_bytes(history)
+    try:
+        return csv_data, result_store.to_parquet_bytes(history), None
+    except Exception as e:
+        return csv_data, None, str(e)
+
+
+def show_rematch(conn, job_description: str):
+    """
+    Match the current JD against the skill index of already-screened candidates
+    and re-score only the best matches with the Recruiter agent.
+    """
+    st.caption(
+        "Uses the JD agent once to extract requirements, then looks them up in the "
+        "skill / title / degree index of stored candidates. Only the shortlist is re-scored."
+    )
+
+    col_k, col_rescore = st.columns([1, 1])
+    with col_k:
+        top_k = st.number_input("Shortlist size", min_value=1, max_value=200, value=10, step=1)
+    with col_rescore:
+        rescore = st.checkbox("Re-score shortlist with Recruiter agent", value=False)
+
+    col_find, col_rebuild = st.columns([1, 1])
+    with col_rebuild:
+        if st.button("♻️ Rebuild skill index from stored results"):
+            indexed = skill_index.rebuild_index(conn)
+            st.success(f"Indexed {indexed} stored screening(s).")
+    with col_find:
+        find_clicked = st.button("🔎 Find best stored candidates")
+
+    if not find_clicked:
+        return
+
+    if job_description.strip() == "":
+        st.error("⚠️ Please upload or paste a Job Description.")
+        return
+
+    with st.spinner("📋 Extracting job requirements..."):
+        jd_requirements = JD_agent({"messages": []})["messages"][0]
+
+    start = time.perf_counter()
+    matches = skill_index.shortlist(conn, jd_requirements, top_k=int(top_k))
+    lookup_ms = (time.perf_counter() - start) * 1000
+
+    jd_terms = skill_index.extract_terms(jd_requirements)
+    st.write(f"JD terms: {', '.join(sorted(jd_terms)) or 'none recognised'}")
+
+    if not matches:
+        st.warning("No stored candidates match the JD requirements.")
+        return
+
+    st.success(f"Shortlisted {len(matches)} candidate(s) in {lookup_ms:.1f} ms.")
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "Resume": m["resume"],
+                    "Index Match (%)": m["match"],
+                    "Matched": ", ".join(m["matched"]),
+                    "Missing": ", ".join(m["missing"]),
+                }
+                for m in matches
+            ]
+        ),
+        use_container_width=True,
+    )
+
+    if not rescore:
+        return
+
+    rescored = []
+    with st.spinner("🧑‍💼 Re-scoring shortlist with the Recruiter agent..."):
+        for m in matches:
+            candidate = result_store.get_candidate(conn, m["candidate_id"])
+            if candidate is None or candidate[1] is None:
+                st.warning(f"Resume PDF for {m['resume']} is not stored; skipping.")
+                continue
+            file_name, resume_pdf, resume_output, redflag_output = candidate
+
+            # Recruiter agent reads Resume.pdf and expects [JD output, red-flag output]
+            with open("Resume.pdf", "wb") as f:
+                f.write(resume_pdf)
+
+            start = time.perf_counter()
+            recruiter_text = recruit_agent({"messages": [jd_requirements, redflag_output]})["messages"][0]
+            elapsed = round(time.perf_counter() - start, 2)
+            score = extract_score_from_text(recruiter_text)
+
+            # Resume / red-flag outputs are reused from the stored screening;
+            # only the JD and Recruiter agents actually ran for this re-score
+            agents = {
+                "Resume_agent": [resume_output],
+                "JD_agent": [jd_requirements],
+                "Redflag_agent": [redflag_output],
+                "Recruiter_agent": [recruiter_text],
+            }
+            result_store.save_screening(
+                conn,
+                file_name,
+                resume_pdf,
+                job_description,
+                agents,
+                score,
+                {
+                    "JD_agent": AGENT_MODELS["JD_agent"],
+                    "Recruiter_agent": AGENT_MODELS["Recruiter_agent"],
+                },
+                PROMPT_VERSION,
+                {"Recruiter_agent": elapsed},
+            )
+            rescored.append({"Resume": file_name, "Index Match (%)": m["match"], "Score": score})
+
+    if rescored:
+        st.markdown("#### 🏆 Re-scored Shortlist")
+        st.dataframe(
+            pd.DataFrame(rescored).sort_values("Score", ascending=False),
+            use_container_width=True,
+        )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,169 @@
+import os
+import zipfile
+
+
+# Resumes larger than this are skipped (override with MAX_RESUME_MB)
+MAX_RESUME_BYTES = int(float(os.getenv("MAX_RESUME_MB", "10")) * 1024 * 1024)
+
+PDF_MAGIC = b"%PDF"
+
+# Server-side resume drops may only be read from inside this folder.
+# Server-path ingestion is disabled when it is not set.
+RESUME_DROP_ROOT = os.getenv("RESUME_DROP_ROOT", "")
+
+
+def _read_limited(fileobj, max_bytes: int):
+    """
+    Read at most max_bytes + 1 bytes, so an entry whose header lies about
+    its size (e.g. a zip bomb) is detected without reading it fully.
+    Returns None if the content is larger than max_bytes.
+    """
+    data = fileobj.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        return None
+    return data
+
+
+def iter_zip_resumes(zip_source, max_bytes: int = MAX_RESUME_BYTES, on_skip=None, prefix: str = ""):
+    """
+    Lazily yield (file_name, pdf_bytes) for every PDF inside a zip archive.
+    file_name is the member path relative to the archive root (e.g. "a/cv.pdf"),
+    so same-named files in different folders stay distinct.
+
+    - zip_source: path to a zip file or a seekable file-like object
+    - on_skip: optional callable(name, reason) for entries that are skipped
+    - prefix: prepended to every name (used for archives found inside folders)
+
+    Members are decompressed one at a time, so only the current resume is
+    held in memory and nothing is extracted to disk.
+    """
+    def skip(name, reason):
+        if on_skip is not None:
+            on_skip(name, reason)
+
+    with zipfile.ZipFile(zip_source) as archive:
+        for info in archive.infolist():
+            name = prefix + info.filename
+            base_name = os.path.basename(name)
+
+            if info.is_dir() or not base_name:
+                continue
+            # macOS archive metadata and hidden files
+            if info.filename.startswith("__MACOSX/") or base_name.startswith("."):
+                continue
+            # Only PDF entries are reported when skipped
+            if not base_name.lower().endswith(".pdf"):
+                continue
+            if info.file_size > max_bytes:
+                skip(name, f"larger than {max_bytes // (1024 * 1024)} MB")
+                continue
+
+            try:
+                with archive.open(info) as member:
+                    data = _read_limited(member, max_bytes)
+            except Exception as e:
+                skip(name, f"could not be read: {e}")
+                continue
+
+            if data is None:
+                skip(name, f"larger than {max_bytes // (1024 * 1024)} MB")
+                continue
+            if not data.startswith(PDF_MAGIC):
+                skip(name, "not a valid PDF")
+                continue
+
+            yield name, data
+
+
+def iter_folder_resumes(folder: str, max_bytes: int = MAX_RESUME_BYTES, on_skip=None):
+    """
+    Lazily yield (file_name, pdf_bytes) for every PDF in a server-side folder
+    (searched recursively). Zip archives found in the folder are ingested too.
+    file_name is the path relative to the folder (members of a nested archive
+    are named "<archive path>/<member path>").
+
+    Other files are ignored without being reported, and files whose real
+    path (e.g. through a symlink) is outside the folder are never read.
+    """
+    folder = os.path.realpath(folder)
+
+    def skip(path, reason):
+        if on_skip is not None:
+            on_skip(os.path.relpath(path, folder), reason)
+
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            lower = file_name.lower()
+
+            if file_name.startswith(".") or not lower.endswith((".pdf", ".zip")):
+                continue
+            if not _is_within(os.path.realpath(path), folder):
+                continue
+            if lower.endswith(".zip"):
+                try:
+                    prefix = os.path.relpath(path, folder) + "/"
+                    yield from iter_zip_resumes(path, max_bytes, on_skip, prefix)
+                except zipfile.BadZipFile:
+                    skip(path, "not a valid zip archive")
+                continue
+
+            try:
+                if os.path.getsize(path) > max_bytes:
+                    skip(path, f"larger than {max_bytes // (1024 * 1024)} MB")
+                    continue
+                with open(path, "rb") as f:
+                    data = _read_limited(f, max_bytes)
+            except OSError as e:
+                skip(path, f"could not be read: {e}")
+                continue
+
+            if data is None:
+                skip(path, f"larger than {max_bytes // (1024 * 1024)} MB")
+                continue
+            if not data.startswith(PDF_MAGIC):
+                skip(path, "not a valid PDF")
+                continue
+
+            yield os.path.relpath(path, folder), data
+
+
+def is_zip_path(path: str) -> bool:
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def _is_within(path: str, root: str) -> bool:
+    return os.path.commonpath([path, root]) == root
+
+
+def resolve_drop_path(path: str, drop_root: str = None) -> str:
+    """
+    Resolve a user-supplied server path (absolute, or relative to the drop root)
+    and make sure it is a folder or zip archive inside RESUME_DROP_ROOT.
+    Raises ValueError otherwise.
+    """
+    drop_root = RESUME_DROP_ROOT if drop_root is None else drop_root
+    if not drop_root:
+        raise ValueError("Server-path ingestion is disabled (RESUME_DROP_ROOT is not set).")
+
+    root = os.path.realpath(drop_root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if not _is_within(resolved, root):
+        raise ValueError(f"{path} is outside the resume drop folder.")
+    if not (os.path.isdir(resolved) or is_zip_path(resolved)):
+        raise ValueError(f"{path} is neither a folder nor a zip archive in the resume drop folder.")
+    return resolved
+
+
+def iter_server_path(path: str, max_bytes: int = MAX_RESUME_BYTES, on_skip=None, drop_root: str = None):
+    """
+    Lazily yield resumes from a server-side zip file or folder inside
+    RESUME_DROP_ROOT (see resolve_drop_path).
+    """
+    path = resolve_drop_path(path, drop_root)
+    if os.path.isdir(path):
+        return iter_folder_resumes(path, max_bytes, on_skip)
+    if is_zip_path(path):
+        return iter_zip_resumes(path, max_bytes, on_skip)
+    raise ValueError(f"{path} is neither a folder nor a zip archive")
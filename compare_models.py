@@ -0,0 +1,235 @@
+"""
+Compare per-agent model configurations on a sample set of resumes.
+
+Runs the multi-agent workflow once per configuration (all-large baseline vs
+tiered small/large) over every PDF in a folder, then reports latency,
+token usage, estimated cost and recruiter score drift.
+
+Usage:
+    python compare_models.py --resumes data --jd data/job_description.txt --output model_tiering_report.md
+"""
+import argparse
+import glob
+import os
+import shutil
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+import multi_agents
+from multi_agents import LARGE_MODEL, SMALL_MODEL, build_workflow, extract_score_from_text
+
+
+# Approximate Groq on-demand prices in USD per 1M tokens: (input, output)
+MODEL_PRICES = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+CONFIGURATIONS = {
+    "baseline (all 70B)": {
+        "Resume_agent": LARGE_MODEL,
+        "JD_agent": LARGE_MODEL,
+        "Redflag_agent": LARGE_MODEL,
+        "Recruiter_agent": LARGE_MODEL,
+    },
+    "tiered (8B extraction, 70B scoring)": {
+        "Resume_agent": SMALL_MODEL,
+        "JD_agent": SMALL_MODEL,
+        "Redflag_agent": SMALL_MODEL,
+        "Recruiter_agent": LARGE_MODEL,
+    },
+}
+
+
+class UsageTracker(BaseCallbackHandler):
+    """
+    Collect latency and token usage for every LLM call made by the graph nodes.
+    """
+
+    def __init__(self):
+        self.started = {}
+        self.calls = []
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        self.started[run_id] = (node, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node, start = self.started.pop(run_id, ("unknown", time.perf_counter()))
+        usage = (response.llm_output or {}).get("token_usage", {}) or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+
+        # Streamed responses carry usage on the message instead of llm_output
+        if not usage and response.generations and response.generations[0]:
+            message = getattr(response.generations[0][0], "message", None)
+            usage_metadata = getattr(message, "usage_metadata", None) or {}
+            input_tokens = usage_metadata.get("input_tokens", 0)
+            output_tokens = usage_metadata.get("output_tokens", 0)
+
+        self.calls.append(
+            {
+                "node": node,
+                "model": multi_agents.AGENT_MODELS.get(node, LARGE_MODEL),
+                "latency": time.perf_counter() - start,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+            }
+        )
+
+
+def estimate_cost(calls) -> float:
+    cost = 0.0
+    for c in calls:
+        price_in, price_out = MODEL_PRICES.get(c["model"], (0.0, 0.0))
+        cost += (c["input_tokens"] * price_in + c["output_tokens"] * price_out) / 1_000_000
+    return cost
+
+
+def run_configuration(name, models, resume_paths):
+    """
+    Run the workflow over all resumes with the given agent->model mapping.
+    Returns a dict of per-resume scores plus aggregated latency / token / cost figures.
+    """
+    multi_agents.AGENT_MODELS.update(models)
+    app_graph = build_workflow()
+
+    scores = {}
+    wall_times = []
+    tracker = UsageTracker()
+
+    for path in resume_paths:
+        shutil.copyfile(path, "Resume.pdf")
+        inputs = {
+            "messages": [
+                "You are a recruitment expert and your role is to match a candidate's profile with a given job description."
+            ]
+        }
+
+        start = time.perf_counter()
+        final_state = app_graph.invoke(inputs, config={"callbacks": [tracker]})
+        wall_times.append(time.perf_counter() - start)
+
+        recruiter_text = str(final_state["messages"][-1])
+        scores[os.path.basename(path)] = extract_score_from_text(recruiter_text)
+        print(f"[{name}] {os.path.basename(path)}: score {scores[os.path.basename(path)]}")
+
+    return {
+        "scores": scores,
+        "total_time": sum(wall_times),
+        "avg_time": sum(wall_times) / len(wall_times),
+        "input_tokens": sum(c["input_tokens"] for c in tracker.calls),
+        "output_tokens": sum(c["output_tokens"] for c in tracker.calls),
+        "cost": estimate_cost(tracker.calls),
+        "node_latency": {
+            node: sum(c["latency"] for c in tracker.calls if c["node"] == node)
+            for node in models
+        },
+    }
+
+
+def build_report(results, resume_paths) -> str:
+    names = list(results)
+    baseline, tiered = results[names[0]], results[names[1]]
+
+    lines = [
+        "# Model Tiering Comparison",
+        "",
+        f"Sample set: {len(resume_paths)} resume(s)",
+        "",
+        "## Configurations",
+        "",
+        "| Configuration | Resume_agent | JD_agent | Redflag_agent | Recruiter_agent |",
+        "|---|---|---|---|---|",
+    ]
+    for name in names:
+        m = CONFIGURATIONS[name]
+        lines.append(
+            f"| {name} | {m['Resume_agent']} | {m['JD_agent']} | {m['Redflag_agent']} | {m['Recruiter_agent']} |"
+        )
+
+    lines += [
+        "",
+        "## Latency & Cost",
+        "",
+        "| Configuration | Total time (s) | Avg per resume (s) | Input tokens | Output tokens | Est. cost (USD) |",
+        "|---|---|---|---|---|---|",
+    ]
+    for name in names:
+        r = results[name]
+        lines.append(
+            f"| {name} | {r['total_time']:.1f} | {r['avg_time']:.1f} | {r['input_tokens']} | "
+            f"{r['output_tokens']} | {r['cost']:.4f} |"
+        )
+
+    time_saving = 1 - tiered["total_time"] / baseline["total_time"] if baseline["total_time"] else 0
+    cost_saving = 1 - tiered["cost"] / baseline["cost"] if baseline["cost"] else 0
+    lines += [
+        "",
+        f"Latency saving: **{time_saving:.0%}**, cost saving: **{cost_saving:.0%}**",
+        "",
+        "## Per-Agent Latency (s, summed over sample set)",
+        "",
+        "| Agent | " + " | ".join(names) + " |",
+        "|---|" + "---|" * len(names),
+    ]
+    for node in CONFIGURATIONS[names[0]]:
+        lines.append(
+            f"| {node} | " + " | ".join(f"{results[n]['node_latency'][node]:.1f}" for n in names) + " |"
+        )
+
+    lines += [
+        "",
+        "## Score Drift",
+        "",
+        f"| Resume | {names[0]} | {names[1]} | Drift |",
+        "|---|---|---|---|",
+    ]
+    drifts = []
+    for resume, base_score in baseline["scores"].items():
+        tier_score = tiered["scores"].get(resume, 0)
+        drifts.append(abs(tier_score - base_score))
+        lines.append(f"| {resume} | {base_score} | {tier_score} | {tier_score - base_score:+d} |")
+
+    lines += [
+        "",
+        f"Mean absolute score drift: **{sum(drifts) / len(drifts):.1f}** points, "
+        f"max: **{max(drifts)}** points",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-agent model configurations.")
+    parser.add_argument("--resumes", default="data", help="Folder containing sample resume PDFs")
+    parser.add_argument("--jd", default="data/job_description.txt", help="Job description text file")
+    parser.add_argument("--output", default="model_tiering_report.md", help="Where to write the Markdown report")
+    args = parser.parse_args()
+
+    resume_paths = sorted(glob.glob(os.path.join(args.resumes, "*.pdf")))
+    if not resume_paths:
+        raise SystemExit(f"No PDF resumes found in {args.resumes}")
+
+    # JD_agent reads JD.txt from the working directory
+    shutil.copyfile(args.jd, "JD.txt")
+
+    original_models = dict(multi_agents.AGENT_MODELS)
+    results = {}
+    try:
+        for name, models in CONFIGURATIONS.items():
+            results[name] = run_configuration(name, models, resume_paths)
+    finally:
+        multi_agents.AGENT_MODELS.update(original_models)
+
+    report = build_report(results, resume_paths)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    print(report)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,11 +38,42 @@ if not GROQ_API_KEY:
     )
 
 
-# Initialize LLM with explicit API key
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    api_key=GROQ_API_KEY
-)
+# ----------------- PER-AGENT MODEL CONFIGURATION -----------------
+
+LARGE_MODEL = "llama-3.3-70b-versatile"
+SMALL_MODEL = "llama-3.1-8b-instant"
+
+# Extraction and red-flag passes run on the small, fast model.
+# Only the recruiter (scoring) agent needs the large model.
+# Each entry can be overridden with an env variable, e.g. RECRUITER_AGENT_MODEL.
+AGENT_MODELS = {
+    "Resume_agent": os.getenv("RESUME_AGENT_MODEL", SMALL_MODEL),
+    "JD_agent": os.getenv("JD_AGENT_MODEL", SMALL_MODEL),
+    "Redflag_agent": os.getenv("REDFLAG_AGENT_MODEL", SMALL_MODEL),
+    "Recruiter_agent": os.getenv("RECRUITER_AGENT_MODEL", LARGE_MODEL),
+}
+
+# Bump when any agent prompt changes, so stored results can be told apart
+PROMPT_VERSION = "v2"
+
+# One client per model name, shared by all agents using that model
+_llm_clients = {}
+
+
+def get_llm(agent_name: str) -> ChatGroq:
+    """
+    Return the LLM client configured for the given agent (node) name.
+    Unknown agents fall back to the large model.
+    """
+    model = AGENT_MODELS.get(agent_name, LARGE_MODEL)
+    if model not in _llm_clients:
+        # streaming=True so LangGraph's "messages" stream mode gets tokens as they arrive
+        _llm_clients[model] = ChatGroq(model=model, api_key=GROQ_API_KEY, streaming=True)
+    return _llm_clients[model]
+
+
+# Default client (large model), kept for callers that import `llm` directly
+llm = get_llm("Recruiter_agent")
 
 
 # TypedDict for AgentState (used by LangGraph)
@@ -53,7 +84,8 @@ class AgentState(TypedDict):
 # ----------------- Resume Name Agent -----------------
 def agent(agentState: AgentState):
     """
-    Extract candidate name and contact details from Resume.pdf.
+    Extract candidate name, contact details, skills, job titles and degrees
+    from Resume.pdf.
     """
     try:
         pdf_file = "Resume.pdf"
@@ -61,12 +93,13 @@ def agent(agentState: AgentState):
         resume_text = " ".join([page.page_content for page in data])
 
         prompt = (
-            "Your task is to extract the candidate name and contact details from the resume data. "
-            "Only respond with the candidate name, contact details and nothing else.\n\n"
+            "Your task is to extract the candidate name and contact details from the resume data, "
+            "followed by three comma-separated lists: Skills, Job Titles and Degrees.\n"
+            "Only respond with the candidate name, contact details, these three lists and nothing else.\n\n"
             f"Resume Data: {resume_text}"
         )
 
-        response = llm.invoke(prompt)
+        response = get_llm("Resume_agent").invoke(prompt)
         answer = response.content
     except Exception as ex:
         answer = f"Error extracting name: {ex}"
@@ -89,7 +122,7 @@ def JD_agent(agentState: AgentState):
             f"Data: {jd_data}"
         )
 
-        response = llm.invoke(prompt)
+        response = get_llm("JD_agent").invoke(prompt)
         # remove newlines to keep it compact
         result = response.content.replace("\n", " ")
     except Exception as ex:
@@ -130,7 +163,7 @@ Resume Data:
 {resume_text}
 """
 
-        response = llm.invoke(prompt)
+        response = get_llm("Redflag_agent").invoke(prompt)
         result = response.content
     except Exception as ex:
         result = f"Error in redflag agent: {ex}"
@@ -138,6 +171,31 @@ Resume Data:
     return {"messages": [result]}
 
 
+# ----------------- Score Parsing -----------------
+def extract_score_from_text(text: str) -> int:
+    """
+    Try to extract a score like '82/100' or 'Score: 82' from the recruiter agent output.
+    Returns 0 if not found.
+    """
+    # Pattern 1: 82/100
+    match = re.search(r'(\d+)\s*/\s*100', text)
+    if match:
+        try:
+            return int(match.group(1))
+        except ValueError:
+            pass
+
+    # Pattern 2: Score: 82
+    match2 = re.search(r'[Ss]core[^0-9]*(\d+)', text)
+    if match2:
+        try:
+            return int(match2.group(1))
+        except ValueError:
+            pass
+
+    return 0
+
+
 # ----------------- Recruit Agent (Evaluation) -----------------
 def recruit_agent(agentState: AgentState):
     """
@@ -198,24 +256,36 @@ Job Description (from previous agents):
 {jd_data}
 """
 
-        response = llm.invoke(prompt)
+        response = get_llm("Recruiter_agent").invoke(prompt)
         answer = response.content
     except Exception as ex:
         answer = f"Error in recruit agent: {ex}"
 
-    match = re.search(r'(\d+)\s*/\s*100', answer)
-    if match:
-        score = int(match.group(1))
-    else:
-        # Fallback: look for "score: 82"
-        match2 = re.search(r'[Ss]core[^0-9]*(\d+)', answer)
-        if match2:
-            score = int(match2.group(1))
-        else:
-            score = 0  # default if nothing found
+    score = extract_score_from_text(answer)
 
     # We keep the original message AND also return the score
     return {
         "messages": [answer],
         "score": score
     }
+
+
+# ----------------- Workflow -----------------
+def build_workflow():
+    """
+    Build and compile the multi-agent LangGraph workflow.
+    """
+    workflow = StateGraph(AgentState)
+    workflow.add_node("Resume_agent", agent)
+    workflow.add_node("JD_agent", JD_agent)
+    workflow.add_node("Redflag_agent", redflag_agent)
+    workflow.add_node("Recruiter_agent", recruit_agent)
+
+    workflow.set_entry_point("Resume_agent")
+    workflow.add_edge("Resume_agent", "JD_agent")
+    workflow.add_edge("Resume_agent", "Redflag_agent")
+    workflow.add_edge("JD_agent", "Recruiter_agent")
+    workflow.add_edge("Redflag_agent", "Recruiter_agent")
+    workflow.add_edge("Recruiter_agent", END)
+
+    return workflow.compile()
@@ -0,0 +1,301 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+
+# Location of the local results database (override with RESULTS_DB_PATH)
+DB_PATH = os.getenv("RESULTS_DB_PATH", "screening_results.db")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jd_hash TEXT UNIQUE NOT NULL,
+    title TEXT,
+    text TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_hash TEXT UNIQUE NOT NULL,
+    file_name TEXT NOT NULL,
+    resume_pdf BLOB,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id),
+    jd_id INTEGER NOT NULL REFERENCES jds(id),
+    score INTEGER NOT NULL,
+    resume_output TEXT,
+    jd_output TEXT,
+    redflag_output TEXT,
+    recruiter_output TEXT,
+    models TEXT,
+    prompt_version TEXT,
+    timings TEXT,
+    total_seconds REAL,
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_screenings_jd_score ON screenings (jd_id, score DESC);
+CREATE INDEX IF NOT EXISTS idx_screenings_score ON screenings (score DESC);
+CREATE INDEX IF NOT EXISTS idx_screenings_candidate ON screenings (candidate_id);
+"""
+
+
+def _hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def get_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Open the results database and create tables / indexes if needed.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def upsert_jd(conn: sqlite3.Connection, jd_text: str) -> int:
+    """
+    Store a job description (deduplicated by content) and return its id.
+    The first non-empty line is used as a short title.
+    """
+    jd_hash = _hash(jd_text.strip())
+    row = conn.execute("SELECT id FROM jds WHERE jd_hash = ?", (jd_hash,)).fetchone()
+    if row:
+        return row[0]
+
+    title = next((line.strip() for line in jd_text.splitlines() if line.strip()), "Untitled JD")
+    cur = conn.execute(
+        "INSERT INTO jds (jd_hash, title, text, created_at) VALUES (?, ?, ?, ?)",
+        (jd_hash, title[:120], jd_text, _now()),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def upsert_candidate(conn: sqlite3.Connection, file_name: str, resume_bytes: bytes) -> int:
+    """
+    Store a candidate and its resume PDF (deduplicated by resume content)
+    and return its id.
+    """
+    resume_hash = _hash(resume_bytes)
+    row = conn.execute(
+        "SELECT id FROM candidates WHERE resume_hash = ?", (resume_hash,)
+    ).fetchone()
+    if row:
+        conn.execute(
+            "UPDATE candidates SET resume_pdf = ? WHERE id = ? AND resume_pdf IS NULL",
+            (resume_bytes, row[0]),
+        )
+        conn.commit()
+        return row[0]
+
+    cur = conn.execute(
+        "INSERT INTO candidates (resume_hash, file_name, resume_pdf, created_at) VALUES (?, ?, ?, ?)",
+        (resume_hash, file_name, resume_bytes, _now()),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def save_screening(
+    conn: sqlite3.Connection,
+    file_name: str,
+    resume_bytes: bytes,
+    jd_text: str,
+    agents: dict,
+    score: int,
+    models: dict,
+    prompt_version: str,
+    timings: dict,
+) -> int:
+    """
+    Persist one screening run (candidate x JD) with all agent outputs.
+
+    - agents: node name -> list of output texts (as collected in app.py)
+    - models: node name -> model used
+    - timings: node name -> seconds from pipeline start until the node finished
+
+    Returns the new screening id.
+    """
+    candidate_id = upsert_candidate(conn, file_name, resume_bytes)
+    jd_id = upsert_jd(conn, jd_text)
+
+    def joined(key):
+        return "\n\n".join(agents.get(key, []))
+
+    cur = conn.execute(
+        """
+        INSERT INTO screenings (
+            candidate_id, jd_id, score,
+            resume_output, jd_output, redflag_output, recruiter_output,
+            models, prompt_version, timings, total_seconds, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            candidate_id,
+            jd_id,
+            score,
+            joined("Resume_agent"),
+            joined("JD_agent"),
+            joined("Redflag_agent"),
+            joined("Recruiter_agent"),
+            json.dumps(models),
+            prompt_version,
+            json.dumps(timings),
+            max(timings.values()) if timings else None,
+            _now(),
+        ),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def get_candidate(conn: sqlite3.Connection, candidate_id: int):
+    """
+    Return (file_name, resume_pdf bytes, latest resume output, latest redflag output)
+    for a candidate, or None if it does not exist.
+    """
+    row = conn.execute(
+        "SELECT file_name, resume_pdf FROM candidates WHERE id = ?", (candidate_id,)
+    ).fetchone()
+    if row is None:
+        return None
+
+    latest = conn.execute(
+        "SELECT resume_output, redflag_output FROM screenings "
+        "WHERE candidate_id = ? ORDER BY id DESC LIMIT 1",
+        (candidate_id,),
+    ).fetchone()
+    resume_output, redflag_output = latest if latest else ("", "")
+    return row[0], row[1], resume_output or "", redflag_output or ""
+
+
+def get_screening_outputs(conn: sqlite3.Connection, screening_id: int):
+    """
+    Return node name -> output text for one stored screening, or None if it does not exist.
+    """
+    row = conn.execute(
+        "SELECT resume_output, jd_output, redflag_output, recruiter_output "
+        "FROM screenings WHERE id = ?",
+        (screening_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(["Resume_agent", "JD_agent", "Redflag_agent", "Recruiter_agent"], row))
+
+
+def list_jds(conn: sqlite3.Connection) -> pd.DataFrame:
+    """
+    All stored job descriptions with how many candidates were screened against each.
+    """
+    return pd.read_sql_query(
+        """
+        SELECT j.id, j.title, j.created_at, COUNT(s.id) AS screenings
+        FROM jds j
+        LEFT JOIN screenings s ON s.jd_id = j.id
+        GROUP BY j.id
+        ORDER BY j.created_at DESC
+        """,
+        conn,
+    )
+
+
+def get_ranking(
+    conn: sqlite3.Connection,
+    jd_id: int = None,
+    min_score: int = 0,
+    limit: int = None,
+) -> pd.DataFrame:
+    """
+    Rank stored candidates by score, optionally for a single JD.
+    Only the latest screening per (candidate, JD) pair is considered.
+    """
+    query = """
+        SELECT c.file_name AS resume, s.score, j.title AS jd, s.prompt_version,
+               s.models, s.total_seconds, s.created_at, s.id AS screening_id
+        FROM screenings s
+        JOIN candidates c ON c.id = s.candidate_id
+        JOIN jds j ON j.id = s.jd_id
+        WHERE s.id IN (
+            SELECT MAX(id) FROM screenings GROUP BY candidate_id, jd_id
+        )
+        AND s.score >= ?
+    """
+    params = [min_score]
+    if jd_id is not None:
+        query += " AND s.jd_id = ?"
+        params.append(jd_id)
+    query += " ORDER BY s.score DESC, s.created_at DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def get_history(
+    conn: sqlite3.Connection,
+    jd_id: int = None,
+    min_score: int = 0,
+    limit: int = None,
+) -> pd.DataFrame:
+    """
+    Screenings with full agent outputs, newest first, optionally for a single JD.
+    No limit by default, so exports contain every matching row.
+    """
+    query = """
+        SELECT s.id AS screening_id, c.file_name AS resume, j.title AS jd, s.score,
+               s.resume_output, s.jd_output, s.redflag_output, s.recruiter_output,
+               s.models, s.prompt_version, s.timings, s.total_seconds, s.created_at
+        FROM screenings s
+        JOIN candidates c ON c.id = s.candidate_id
+        JOIN jds j ON j.id = s.jd_id
+        WHERE s.score >= ?
+    """
+    params = [min_score]
+    if jd_id is not None:
+        query += " AND s.jd_id = ?"
+        params.append(jd_id)
+    query += " ORDER BY s.id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def get_latest_screening_id(conn: sqlite3.Connection) -> int:
+    """
+    Id of the newest screening (0 if none); changes whenever results are added.
+    """
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM screenings").fetchone()[0]
+
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame to Parquet (requires pyarrow).
+    """
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
@@ -0,0 +1,313 @@
+import math
+import re
+import sqlite3
+
+
+# Canonical term -> (category, aliases). Matching is case-insensitive on word boundaries.
+TERM_VOCABULARY = {
+    # ---- Skills ----
+    "python": ("skill", ["python"]),
+    "java": ("skill", ["java"]),
+    "javascript": ("skill", ["javascript", "js", "ecmascript"]),
+    "typescript": ("skill", ["typescript"]),
+    "c++": ("skill", ["c++", "cpp"]),
+    "c#": ("skill", ["c#", "csharp"]),
+    "go": ("skill", ["golang", "go lang"]),
+    "r": ("skill", ["r programming", "r language"]),
+    "sql": ("skill", ["sql", "mysql", "postgresql", "postgres", "sqlite", "t-sql", "pl/sql"]),
+    "nosql": ("skill", ["nosql", "mongodb", "cassandra", "dynamodb"]),
+    "html/css": ("skill", ["html", "css", "html5", "css3"]),
+    "react": ("skill", ["react", "reactjs", "react.js"]),
+    "angular": ("skill", ["angular", "angularjs"]),
+    "node.js": ("skill", ["nodejs", "node.js"]),
+    "django": ("skill", ["django"]),
+    "flask": ("skill", ["flask"]),
+    "fastapi": ("skill", ["fastapi"]),
+    "spring": ("skill", ["spring boot", "springboot", "spring framework"]),
+    "machine learning": ("skill", ["machine learning"]),
+    "deep learning": ("skill", ["deep learning", "neural networks", "neural network"]),
+    "nlp": ("skill", ["nlp", "natural language processing"]),
+    "computer vision": ("skill", ["computer vision", "opencv", "image processing"]),
+    "generative ai": ("skill", ["generative ai", "genai", "llm", "llms", "large language models"]),
+    "langchain": ("skill", ["langchain", "langgraph"]),
+    "tensorflow": ("skill", ["tensorflow", "keras"]),
+    "pytorch": ("skill", ["pytorch"]),
+    "scikit-learn": ("skill", ["scikit-learn", "sklearn", "scikit learn"]),
+    "pandas": ("skill", ["pandas"]),
+    "numpy": ("skill", ["numpy"]),
+    "data analysis": ("skill", ["data analysis", "data analytics", "exploratory data analysis", "eda"]),
+    "data visualization": ("skill", ["data visualization", "matplotlib", "seaborn", "plotly"]),
+    "statistics": ("skill", ["statistics", "statistical analysis", "hypothesis testing"]),
+    "power bi": ("skill", ["power bi", "powerbi"]),
+    "tableau": ("skill", ["tableau"]),
+    "excel": ("skill", ["ms excel", "microsoft excel"]),
+    "spark": ("skill", ["spark", "pyspark", "apache spark"]),
+    "hadoop": ("skill", ["hadoop", "hdfs", "apache hive"]),
+    "airflow": ("skill", ["airflow"]),
+    "etl": ("skill", ["etl", "data pipelines", "data pipeline"]),
+    "aws": ("skill", ["aws", "amazon web services", "ec2", "s3", "aws lambda"]),
+    "azure": ("skill", ["azure", "microsoft azure"]),
+    "gcp": ("skill", ["gcp", "google cloud", "google cloud platform", "bigquery"]),
+    "docker": ("skill", ["docker", "containers", "containerization"]),
+    "kubernetes": ("skill", ["kubernetes", "k8s"]),
+    "ci/cd": ("skill", ["ci/cd", "cicd", "jenkins", "github actions", "gitlab ci"]),
+    "git": ("skill", ["git", "github", "gitlab", "version control"]),
+    "linux": ("skill", ["linux", "unix", "bash", "shell scripting"]),
+    "rest api": ("skill", ["rest api", "restful", "api development"]),
+    "microservices": ("skill", ["microservices", "microservice"]),
+    "streamlit": ("skill", ["streamlit"]),
+    "mlops": ("skill", ["mlops", "mlflow", "model deployment"]),
+    "agile": ("skill", ["agile", "scrum", "kanban"]),
+    "communication": ("skill", ["communication skills"]),
+    # ---- Titles ----
+    "software engineer": ("title", ["software engineer", "software developer", "sde", "programmer"]),
+    "data scientist": ("title", ["data scientist"]),
+    "data analyst": ("title", ["data analyst", "business analyst"]),
+    "data engineer": ("title", ["data engineer"]),
+    "machine learning engineer": ("title", ["machine learning engineer", "ml engineer", "ai engineer"]),
+    "web developer": ("title", ["web developer", "frontend developer", "front-end developer",
+                                "backend developer", "back-end developer", "full stack developer",
+                                "full-stack developer"]),
+    "devops engineer": ("title", ["devops engineer", "site reliability engineer", "sre"]),
+    "research assistant": ("title", ["research assistant", "research intern", "researcher"]),
+    "intern": ("title", ["summer intern", "graduate trainee"]),
+    "project manager": ("title", ["project manager", "product manager", "program manager"]),
+    "team lead": ("title", ["team lead", "tech lead", "technical lead"]),
+    # ---- Degrees ----
+    "bachelor": ("degree", ["bachelor", "bachelors", "bachelor's", "b.tech", "btech", "b.e.", "b.e",
+                            "b.sc", "bsc", "b.s.", "bca", "undergraduate"]),
+    "master": ("degree", ["master", "masters", "master's", "m.tech", "mtech", "m.e.", "m.sc", "msc",
+                          "m.s.", "mca", "mba", "postgraduate"]),
+    "phd": ("degree", ["phd", "ph.d", "ph.d.", "doctorate"]),
+    "diploma": ("degree", ["diploma"]),
+    "computer science": ("degree", ["computer science", "cse", "computer engineering", "information technology"]),
+    "data science": ("degree", ["data science"]),
+    "artificial intelligence": ("degree", ["artificial intelligence"]),
+}
+
+# Short or ambiguous names that only count when they are a whole list item
+# (e.g. "Skills: Go, R, Excel"), never inside prose
+LIST_ITEM_ALIASES = {
+    "go": "go",
+    "r": "r",
+    "excel": "excel",
+    "spring": "spring",
+    "node": "node.js",
+    "ml": "machine learning",
+    "torch": "pytorch",
+    "hive": "hadoop",
+    "rag": "generative ai",
+    "communication": "communication",
+    "intern": "intern",
+    "internship": "intern",
+    "trainee": "intern",
+}
+
+
+def _build_matcher():
+    """
+    Compile every alias into one regex; longer aliases first so
+    "machine learning engineer" wins over "machine learning".
+    """
+    alias_to_term = {}
+    for term, (_, aliases) in TERM_VOCABULARY.items():
+        for alias in aliases:
+            alias_to_term[alias.lower()] = term
+
+    ordered = sorted(alias_to_term, key=len, reverse=True)
+    pattern = r"(?<![\w+#.])(" + "|".join(re.escape(a) for a in ordered) + r")(?![\w+#])"
+    return re.compile(pattern, re.IGNORECASE), alias_to_term
+
+
+_MATCHER, _ALIAS_TO_TERM = _build_matcher()
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS term_postings (
+    term TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id),
+    PRIMARY KEY (term, candidate_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_term_postings_candidate ON term_postings (candidate_id);
+"""
+
+
+def extract_terms(text: str) -> set:
+    """
+    Return the set of normalized skills, titles and degrees mentioned in text.
+    """
+    if not text:
+        return set()
+    return {_ALIAS_TO_TERM[m.group(1).lower()] for m in _MATCHER.finditer(text)}
+
+
+# Section headers of the lists produced by the Resume_agent prompt,
+# e.g. "Skills: Python, SQL" or "**Degrees:**" followed by bullet points
+_SECTION_RE = re.compile(
+    r"^[\s*#_]*(skills|job titles|titles|degrees)[\s*_]*:[\s*_]*(.*)$", re.IGNORECASE
+)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.*)$")
+
+
+def extract_list_items(resume_output: str) -> list:
+    """
+    Return the items of the Skills / Job Titles / Degrees lists in a
+    Resume_agent output. Text outside those lists (name, contact details,
+    prose) is ignored.
+    """
+    items = []
+    in_section = False
+
+    for line in (resume_output or "").splitlines():
+        header = _SECTION_RE.match(line)
+        if header:
+            in_section = True
+            content = header.group(2)
+        elif not line.strip():
+            continue
+        elif in_section and _BULLET_RE.match(line):
+            content = _BULLET_RE.match(line).group(1)
+        else:
+            in_section = False
+            continue
+
+        for item in re.split(r"[,;|]", content):
+            item = item.strip(" *_.\t")
+            if item:
+                items.append(item)
+
+    return items
+
+
+def extract_resume_terms(resume_output: str) -> set:
+    """
+    Return the normalized terms listed in a Resume_agent output's
+    Skills / Job Titles / Degrees lists.
+    """
+    terms = set()
+    for item in extract_list_items(resume_output):
+        alias = LIST_ITEM_ALIASES.get(item.lower())
+        if alias:
+            terms.add(alias)
+        else:
+            terms |= extract_terms(item)
+    return terms
+
+
+def term_category(term: str) -> str:
+    return TERM_VOCABULARY.get(term, ("skill", []))[0]
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    conn.executescript(SCHEMA)
+
+
+def index_screening(conn: sqlite3.Connection, screening_id: int) -> set:
+    """
+    Add the terms from a stored screening's Resume_agent Skills / Job Titles /
+    Degrees lists to the inverted index for that candidate. Returns the indexed terms.
+
+    Red-flag output is not indexed: it mostly names what a candidate lacks
+    ("no experience with Python"), which must not count as a match.
+    """
+    ensure_schema(conn)
+    row = conn.execute(
+        "SELECT candidate_id, resume_output FROM screenings WHERE id = ?",
+        (screening_id,),
+    ).fetchone()
+    if row is None:
+        return set()
+
+    candidate_id, resume_output = row
+    terms = extract_resume_terms(resume_output)
+    conn.executemany(
+        "INSERT OR IGNORE INTO term_postings (term, candidate_id) VALUES (?, ?)",
+        [(term, candidate_id) for term in terms],
+    )
+    conn.commit()
+    return terms
+
+
+def rebuild_index(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild the whole index from all stored screenings (e.g. after the
+    vocabulary changes). Returns the number of screenings indexed.
+    """
+    ensure_schema(conn)
+    conn.execute("DELETE FROM term_postings")
+    conn.commit()
+    ids = [r[0] for r in conn.execute("SELECT id FROM screenings")]
+    for screening_id in ids:
+        index_screening(conn, screening_id)
+    return len(ids)
+
+
+def shortlist(conn: sqlite3.Connection, jd_requirements: str, top_k: int = 20) -> list:
+    """
+    Rank indexed candidates against the terms in a JD's extracted requirements.
+
+    Each matched term contributes its IDF (rare terms count more); the score is
+    the share of the JD's total term weight the candidate covers (0–100).
+
+    Returns a list of dicts, best first:
+        {"candidate_id", "resume", "match", "matched", "missing"}
+    """
+    ensure_schema(conn)
+    jd_terms = extract_terms(jd_requirements)
+    if not jd_terms:
+        return []
+
+    total_candidates = conn.execute(
+        "SELECT COUNT(DISTINCT candidate_id) FROM term_postings"
+    ).fetchone()[0]
+    if total_candidates == 0:
+        return []
+
+    placeholders = ",".join("?" for _ in jd_terms)
+    postings = conn.execute(
+        f"SELECT term, candidate_id FROM term_postings WHERE term IN ({placeholders})",
+        list(jd_terms),
+    ).fetchall()
+
+    doc_freq = {}
+    matched_by_candidate = {}
+    for term, candidate_id in postings:
+        doc_freq[term] = doc_freq.get(term, 0) + 1
+        matched_by_candidate.setdefault(candidate_id, set()).add(term)
+
+    # Smoothed IDF so terms nobody has still count towards the JD total
+    weights = {
+        term: math.log((total_candidates + 1) / (doc_freq.get(term, 0) + 1)) + 1
+        for term in jd_terms
+    }
+    total_weight = sum(weights.values())
+
+    ranked = sorted(
+        (
+            (sum(weights[t] for t in matched) / total_weight * 100, candidate_id, matched)
+            for candidate_id, matched in matched_by_candidate.items()
+        ),
+        key=lambda x: (-x[0], x[1]),
+    )[:top_k]
+
+    if not ranked:
+        return []
+
+    names = dict(
+        conn.execute(
+            f"SELECT id, file_name FROM candidates WHERE id IN ({','.join('?' for _ in ranked)})",
+            [candidate_id for _, candidate_id, _ in ranked],
+        ).fetchall()
+    )
+
+    return [
+        {
+            "candidate_id": candidate_id,
+            "resume": names.get(candidate_id, ""),
+            "match": round(match, 1),
+            "matched": sorted(matched),
+            "missing": sorted(jd_terms - matched),
+        }
+        for match, candidate_id, matched in ranked
+    ]
@@ -0,0 +1,117 @@
+import io
+import os
+import struct
+import zipfile
+
+import pytest
+
+import bulk_ingest
+
+
+PDF = b"%PDF-1.4 resume"
+
+
+def make_zip(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def collect(iterator):
+    skipped = []
+    names = [name for name, _ in iterator(lambda name, reason: skipped.append((name, reason)))]
+    return names, skipped
+
+
+@pytest.fixture
+def drop_root(tmp_path):
+    root = tmp_path / "drop"
+    (root / "batch").mkdir(parents=True)
+    (root / "batch" / "cv.pdf").write_bytes(PDF)
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "secret.pdf").write_bytes(PDF)
+    return root
+
+
+def test_resolve_drop_path_stays_inside_root(drop_root, tmp_path):
+    assert bulk_ingest.resolve_drop_path("batch", str(drop_root)) == os.path.realpath(drop_root / "batch")
+
+    for path in ["../outside", "batch/../../outside", str(tmp_path / "outside")]:
+        with pytest.raises(ValueError, match="outside"):
+            bulk_ingest.resolve_drop_path(path, str(drop_root))
+
+    os.symlink(tmp_path / "outside", drop_root / "link")
+    with pytest.raises(ValueError, match="outside"):
+        bulk_ingest.resolve_drop_path("link", str(drop_root))
+
+    with pytest.raises(ValueError, match="disabled"):
+        bulk_ingest.resolve_drop_path("batch", "")
+
+
+def test_folder_ignores_symlinks_out_of_the_folder(drop_root, tmp_path):
+    os.symlink(tmp_path / "outside" / "secret.pdf", drop_root / "batch" / "escape.pdf")
+    os.symlink(tmp_path / "outside", drop_root / "batch" / "escape_dir")
+
+    names, skipped = collect(
+        lambda on_skip: bulk_ingest.iter_server_path("batch", on_skip=on_skip, drop_root=str(drop_root))
+    )
+    assert names == ["cv.pdf"]
+    assert skipped == []
+
+
+def test_read_limited_stops_after_the_limit():
+    assert bulk_ingest._read_limited(io.BytesIO(b"x" * 10), 10) == b"x" * 10
+    assert bulk_ingest._read_limited(io.BytesIO(b"x" * 11), 10) is None
+
+
+def test_zip_member_with_lying_size_is_not_yielded():
+    data = bytearray(make_zip({"cv.pdf": PDF + b"0" * 8192}))
+    # Claim 100 bytes in both the local and the central directory header
+    for signature, offset in ((b"PK\x03\x04", 22), (b"PK\x01\x02", 24)):
+        struct.pack_into("<I", data, data.index(signature) + offset, 100)
+
+    names, skipped = collect(
+        lambda on_skip: bulk_ingest.iter_zip_resumes(io.BytesIO(bytes(data)), 1024, on_skip)
+    )
+    assert names == []
+    assert [name for name, _ in skipped] == ["cv.pdf"]
+
+
+def test_zip_skips_metadata_and_reports_bad_entries():
+    data = make_zip(
+        {
+            "a/cv.pdf": PDF,
+            "b/cv.pdf": PDF,
+            "__MACOSX/a/._cv.pdf": PDF,
+            "a/.hidden.pdf": PDF,
+            "notes.txt": b"not a resume",
+            "big.pdf": PDF + b"0" * 2048,
+            "fake.pdf": b"<html>",
+        }
+    )
+
+    names, skipped = collect(lambda on_skip: bulk_ingest.iter_zip_resumes(io.BytesIO(data), 1024, on_skip))
+    assert names == ["a/cv.pdf", "b/cv.pdf"]
+    reasons = dict(skipped)
+    assert sorted(reasons) == ["big.pdf", "fake.pdf"]
+    assert reasons["big.pdf"].startswith("larger than")
+    assert reasons["fake.pdf"] == "not a valid PDF"
+
+
+def test_folder_ingests_nested_zips_with_prefixed_names(tmp_path):
+    (tmp_path / "team").mkdir()
+    (tmp_path / "top.pdf").write_bytes(PDF)
+    (tmp_path / "team" / "resumes.zip").write_bytes(make_zip({"x/cv.pdf": PDF, "__MACOSX/x/._cv.pdf": PDF}))
+    (tmp_path / "team" / "broken.zip").write_bytes(b"PK not really a zip")
+    (tmp_path / ".hidden.pdf").write_bytes(PDF)
+
+    names, skipped = collect(lambda on_skip: bulk_ingest.iter_folder_resumes(str(tmp_path), on_skip=on_skip))
+    assert names == ["top.pdf", "team/resumes.zip/x/cv.pdf"]
+    assert skipped == [(os.path.join("team", "broken.zip"), "not a valid zip archive")]
+
+
+def test_corrupt_archive_raises_bad_zip_file():
+    with pytest.raises(zipfile.BadZipFile):
+        list(bulk_ingest.iter_zip_resumes(io.BytesIO(b"definitely not a zip")))
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+import skill_index
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE candidates (id INTEGER PRIMARY KEY, file_name TEXT);
+        CREATE TABLE screenings (
+            id INTEGER PRIMARY KEY,
+            candidate_id INTEGER,
+            resume_output TEXT,
+            redflag_output TEXT
+        );
+        """
+    )
+    yield conn
+    conn.close()
+
+
+def add_screening(conn, candidate_id, resume_output, redflag_output=""):
+    conn.execute(
+        "INSERT INTO candidates (id, file_name) VALUES (?, ?)",
+        (candidate_id, f"cv{candidate_id}.pdf"),
+    )
+    cur = conn.execute(
+        "INSERT INTO screenings (candidate_id, resume_output, redflag_output) VALUES (?, ?, ?)",
+        (candidate_id, resume_output, redflag_output),
+    )
+    return skill_index.index_screening(conn, cur.lastrowid)
+
+
+def test_red_flag_negations_are_not_indexed(conn):
+    lacking = add_screening(
+        conn,
+        1,
+        "Jane Doe, jane@example.com\nSkills: Java\nJob Titles: Data Analyst\nDegrees: Diploma",
+        "- No experience with Python, AWS or Docker\n- No Bachelor's degree",
+    )
+    qualified = add_screening(
+        conn,
+        2,
+        "John Roe, john@example.com\nSkills: Python, AWS, Docker\nJob Titles: Data Engineer\nDegrees: B.Tech",
+    )
+
+    assert not lacking & {"python", "aws", "docker", "bachelor"}
+    assert {"python", "aws", "docker", "bachelor"} <= qualified
+
+    results = skill_index.shortlist(conn, "Python, AWS and Docker experience", top_k=10)
+    assert [r["candidate_id"] for r in results] == [2]
+    assert results[0]["match"] == 100.0
+
+
+def test_only_structured_lists_are_indexed(conn):
+    terms = add_screening(
+        conn,
+        1,
+        "Name: Alex Kim\nSummary: worked with Kubernetes for years\n"
+        "**Skills:**\n- Python\n- SQL\n\n**Degrees:** M.Sc in Computer Science",
+    )
+
+    assert terms == {"python", "sql", "master", "computer science"}
+
+
+def test_short_aliases_match_only_as_list_items():
+    terms = skill_index.extract_resume_terms(
+        "Skills: Go, R, Excel, AI\nJob Titles: Intern\nDegrees: B.Sc"
+    )
+    assert {"go", "r", "excel", "intern", "bachelor"} <= terms
+    assert "artificial intelligence" not in terms
+
+    prose = "Spring 2021 internship: excel in communication, node of the team, AI and ML projects"
+    assert skill_index.extract_terms(prose) == set()